@@ -0,0 +1,44 @@
+import contextlib
+import hashlib
+import os
+import shelve
+
+CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"),
+    "phone_tracker",
+)
+CACHE_FILE = os.path.join(CACHE_DIR, "geocache.db")
+
+
+def _key(location):
+    return hashlib.blake2b(location.encode("utf-8"), digest_size=16).hexdigest()
+
+
+@contextlib.contextmanager
+def open_cache():
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        db = shelve.open(CACHE_FILE)
+    except Exception:
+        # Unwritable cache directory or a shelf locked by another run:
+        # carry on with a throwaway in-memory cache instead of failing.
+        db = {}
+    try:
+        yield db
+    finally:
+        if isinstance(db, shelve.Shelf):
+            db.close()
+
+
+def get(db, location):
+    try:
+        return db.get(_key(location))
+    except Exception:
+        return None
+
+
+def set(db, location, point):
+    try:
+        db[_key(location)] = tuple(point)
+    except Exception:
+        pass
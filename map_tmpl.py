@@ -0,0 +1,69 @@
+MAP_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1.0">
+<title>Phone Number Map</title>
+<link rel="stylesheet" href="https://unpkg.com/leaflet@1.9.4/dist/leaflet.css">
+<script src="https://unpkg.com/leaflet@1.9.4/dist/leaflet.js"></script>
+<style>html, body, #map { width: 100%%; height: 100%%; margin: 0; padding: 0; }</style>
+</head>
+<body>
+<div id="map"></div>
+<script>
+var map = L.map("map").setView([%(lat)f, %(lng)f], 11);
+L.tileLayer("https://{s}.basemaps.cartocdn.com/dark_all/{z}/{x}/{y}{r}.png", {
+    attribution: "&copy; OpenStreetMap contributors &copy; CARTO",
+    subdomains: "abcd",
+    maxZoom: 20
+}).addTo(map);
+L.marker([%(lat)f, %(lng)f]).addTo(map)
+    .bindPopup(%(popup)s, {maxWidth: 400})
+    .bindTooltip(%(tooltip)s);
+L.circleMarker([%(lat)f, %(lng)f], {
+    radius: 15,
+    color: "#FF0000",
+    fillColor: "#FF0000",
+    fillOpacity: 0.3,
+    weight: 2
+}).addTo(map);
+</script>
+</body>
+</html>
+"""
+
+BATCH_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1.0">
+<title>Phone Number Map</title>
+<link rel="stylesheet" href="https://unpkg.com/leaflet@1.9.4/dist/leaflet.css">
+<link rel="stylesheet" href="https://unpkg.com/leaflet.markercluster@1.5.3/dist/MarkerCluster.css">
+<link rel="stylesheet" href="https://unpkg.com/leaflet.markercluster@1.5.3/dist/MarkerCluster.Default.css">
+<script src="https://unpkg.com/leaflet@1.9.4/dist/leaflet.js"></script>
+<script src="https://unpkg.com/leaflet.markercluster@1.5.3/dist/leaflet.markercluster.js"></script>
+<style>html, body, #map { width: 100%%; height: 100%%; margin: 0; padding: 0; }</style>
+</head>
+<body>
+<div id="map"></div>
+<script>
+var LOCATIONS = %(locations)s;
+var map = L.map("map");
+L.tileLayer("https://{s}.basemaps.cartocdn.com/dark_all/{z}/{x}/{y}{r}.png", {
+    attribution: "&copy; OpenStreetMap contributors &copy; CARTO",
+    subdomains: "abcd",
+    maxZoom: 20
+}).addTo(map);
+var cluster = L.markerClusterGroup();
+LOCATIONS.forEach(function (loc) {
+    cluster.addLayer(L.marker([loc.lat, loc.lng])
+        .bindPopup(loc.popup, {maxWidth: 400})
+        .bindTooltip(loc.tooltip));
+});
+map.addLayer(cluster);
+map.fitBounds(cluster.getBounds(), {padding: [40, 40], maxZoom: 11});
+</script>
+</body>
+</html>
+"""
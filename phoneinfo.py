@@ -1,15 +1,64 @@
 #!/usr/bin/env python3
 
 import argparse
+import html
+import json
 import os
+import re
 import sys
+import threading
+import time
 import webbrowser
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 
-import folium
 import phonenumbers
 from phonenumbers import carrier, geocoder
-from opencage.geocoder import OpenCageGeocode
+
+import geo_cache
+from map_tmpl import BATCH_TEMPLATE, MAP_TEMPLATE
+
+# Indexed by phonenumbers.PhoneNumberType; anything past VOICEMAIL is "Unknown".
+_PHONE_TYPES = (
+    "Fixed Line",
+    "Mobile",
+    "Fixed Line or Mobile",
+    "Toll Free",
+    "Premium Rate",
+    "Shared Cost",
+    "VoIP",
+    "Personal Number",
+    "Pager",
+    "UAN",
+    "Voicemail",
+)
+
+# Cheap shape check run before phonenumbers.parse so malformed input never
+# reaches the metadata lookup: "+" then the 7-15 digits E.164 allows.
+_PHONE_RE = re.compile(r"\+[0-9]{7,15}")
+_SEPARATOR_RE = re.compile(r"[\s().-]")
+
+_GEOCLIENT_CACHE = {}
+
+
+class _GeocodingStopped(Exception):
+    pass
+
+
+# Spaces request starts at least 1/rate seconds apart across all threads.
+class _Throttle:
+    def __init__(self, rate):
+        self.interval = 1.0 / rate
+        self.lock = threading.Lock()
+        self.next_start = 0.0
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            if now < self.next_start:
+                time.sleep(self.next_start - now)
+                now = self.next_start
+            self.next_start = now + self.interval
 
 
 class Colors:
@@ -46,123 +95,331 @@ def colored(text, color, bold=False):
     return f"{prefix}{text}{Colors.END}"
 
 
-def get_phone_info(phone_str, api_key):
+def _info_row(label, value, color):
+    pad = " " * max(1, 15 - len(label))
+    return f"  {colored(label, Colors.BLUE, bold=True)}{pad}{color}{value}{Colors.END}\n"
+
+
+# The summary frame never changes shape, so its colored labels and
+# padding are rendered once here and print_info only fills in values.
+_INFO_HEAD = (
+    "\n"
+    + colored("═" * 70, Colors.CYAN) + "\n"
+    + colored("                    PHONE NUMBER INFORMATION", Colors.CYAN, bold=True) + "\n"
+    + colored("═" * 70, Colors.CYAN) + "\n"
+    + _info_row("Phone Number:", "{number}", Colors.GREEN)
+    + _info_row("Country Code:", "{country_code}", Colors.GREEN)
+    + _info_row("National Number:", "{national_number}", Colors.GREEN)
+    + _info_row("Number Type:", "{type}", Colors.GREEN)
+    + _info_row("Location:", "{location}", Colors.GREEN)
+    + _info_row("Carrier:", "{carrier}", Colors.GREEN)
+)
+_INFO_COORDS = _info_row("Coordinates:", "{latitude:.6f}, {longitude:.6f}", Colors.MAGENTA)
+_INFO_TAIL = (
+    _info_row("Timestamp:", "{timestamp}", Colors.YELLOW)
+    + colored("═" * 70, Colors.CYAN) + "\n\n"
+)
+
+
+def normalize_number(phone_str):
+    phone_str = _SEPARATOR_RE.sub("", phone_str)
+    if not phone_str.startswith("+"):
+        phone_str = "+" + phone_str
+    return phone_str
+
+
+def validate_number(phone_str):
+    if not _PHONE_RE.fullmatch(phone_str):
+        raise ValueError("Invalid phone number format (expected + followed by 7-15 digits)")
+
     try:
         parsed = phonenumbers.parse(phone_str)
     except phonenumbers.NumberParseException as e:
-        print(colored(f"\n[✗] Error parsing number: {e}\n", Colors.RED, bold=True))
-        sys.exit(1)
+        raise ValueError(f"Error parsing number: {e}")
 
     if not phonenumbers.is_valid_number(parsed):
-        print(colored("\n[✗] Invalid or unsupported phone number format\n", Colors.RED, bold=True))
-        sys.exit(1)
+        raise ValueError("Invalid or unsupported phone number format")
 
-    print(colored("\n[✓] Valid number detected", Colors.GREEN))
-    print(colored("[+] Gathering information...\n", Colors.YELLOW))
+    return parsed
 
-    location = geocoder.description_for_number(parsed, "en") or "Unknown location"
-    carrier_name = carrier.name_for_number(parsed, "en") or "Unknown carrier"
-    country_code = f"+{parsed.country_code}"
-    national_number = parsed.national_number
-    
-    number_type = phonenumbers.number_type(parsed)
-    type_map = {
-        0: "Fixed Line",
-        1: "Mobile",
-        2: "Fixed Line or Mobile",
-        3: "Toll Free",
-        4: "Premium Rate",
-        5: "Shared Cost",
-        6: "VoIP",
-        7: "Personal Number",
-        8: "Pager",
-        9: "UAN",
-        10: "Voicemail",
-        99: "Unknown"
-    }
-    phone_type = type_map.get(number_type, "Unknown")
 
-    lat, lng = None, None
-    try:
-        geoclient = OpenCageGeocode(api_key)
-        results = geoclient.geocode(location)
-        if results and len(results) > 0:
-            lat = results[0]['geometry']['lat']
-            lng = results[0]['geometry']['lng']
-            print(colored("[✓] Geocoding successful", Colors.GREEN))
-        else:
-            print(colored("[!] Could not geocode the location description", Colors.YELLOW))
-    except Exception as e:
-        print(colored(f"[!] Geocoding failed: {e}", Colors.YELLOW))
-
-    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-    print("\n" + colored("═" * 70, Colors.CYAN))
-    print(colored("                    PHONE NUMBER INFORMATION", Colors.CYAN, bold=True))
-    print(colored("═" * 70, Colors.CYAN))
-    print(f"  {colored('Phone Number:', Colors.BLUE, bold=True)}  {colored(phone_str, Colors.GREEN)}")
-    print(f"  {colored('Country Code:', Colors.BLUE, bold=True)}  {colored(country_code, Colors.GREEN)}")
-    print(f"  {colored('National Number:', Colors.BLUE, bold=True)} {colored(str(national_number), Colors.GREEN)}")
-    print(f"  {colored('Number Type:', Colors.BLUE, bold=True)}   {colored(phone_type, Colors.GREEN)}")
-    print(f"  {colored('Location:', Colors.BLUE, bold=True)}      {colored(location, Colors.GREEN)}")
-    print(f"  {colored('Carrier:', Colors.BLUE, bold=True)}       {colored(carrier_name, Colors.GREEN)}")
-    
-    if lat is not None and lng is not None:
-        print(f"  {colored('Coordinates:', Colors.BLUE, bold=True)}   {colored(f'{lat:.6f}, {lng:.6f}', Colors.MAGENTA)}")
-    
-    print(f"  {colored('Timestamp:', Colors.BLUE, bold=True)}     {colored(now, Colors.YELLOW)}")
-    print(colored("═" * 70, Colors.CYAN) + "\n")
-
-    result = {
+def location_for(parsed):
+    return geocoder.description_for_number(parsed, "en") or "Unknown location"
+
+
+def describe_number(phone_str, parsed, location, skip_type=False):
+    phone_type = "N/A"
+    if not skip_type:
+        number_type = phonenumbers.number_type(parsed)
+        phone_type = _PHONE_TYPES[number_type] if number_type < len(_PHONE_TYPES) else "Unknown"
+
+    return {
         "number": phone_str,
-        "location": location,
-        "carrier": carrier_name,
+        "country_code": f"+{parsed.country_code}",
+        "national_number": parsed.national_number,
         "type": phone_type,
-        "timestamp": now
+        "location": location,
+        "carrier": carrier.name_for_number(parsed, "en") or "Unknown carrier",
     }
 
-    if lat is not None and lng is not None:
-        result["latitude"] = lat
-        result["longitude"] = lng
-
-        map_file = f"phone_map_{datetime.now().strftime('%Y%m%d_%H%M%S')}.html"
-
-        m = folium.Map(location=[lat, lng], zoom_start=11, tiles="CartoDB dark_matter")
-        
-        folium.Marker(
-            [lat, lng],
-            popup=folium.Popup(
-                f"<div style='font-family: monospace;'>"
-                f"<b style='color: #00ff00;'>Phone Number:</b> {phone_str}<br>"
-                f"<b style='color: #00ff00;'>Location:</b> {location}<br>"
-                f"<b style='color: #00ff00;'>Carrier:</b> {carrier_name}<br>"
-                f"<b style='color: #00ff00;'>Type:</b> {phone_type}<br>"
-                f"<b style='color: #00ff00;'>Coordinates:</b> {lat:.6f}, {lng:.6f}<br>"
-                f"<b style='color: #00ff00;'>Timestamp:</b> {now}"
-                f"</div>",
-                max_width=400
-            ),
-            tooltip=f"{location} - {carrier_name}",
-            icon=folium.Icon(color="red", icon="phone", prefix="fa")
-        ).add_to(m)
-
-        folium.CircleMarker(
-            [lat, lng],
-            radius=15,
-            color="#FF0000",
-            fill=True,
-            fill_color="#FF0000",
-            fill_opacity=0.3,
-            weight=2
-        ).add_to(m)
-
-        m.save(map_file)
+
+def _get_client(api_key, pool_size=10):
+    client = _GEOCLIENT_CACHE.get(api_key)
+    if client is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        from opencage.geocoder import OpenCageGeocode
+        client = OpenCageGeocode(api_key)
+        # The SDK only keeps a session when used as a context manager and
+        # otherwise opens a new connection per geocode() call. Attach one so
+        # every lookup, including the batch workers, reuses keep-alive
+        # connections from its pool. The pool must be at least as large as
+        # the number of workers, or urllib3 discards the extra connections.
+        client.session = requests.Session()
+        client.session.mount("https://", HTTPAdapter(pool_maxsize=max(10, pool_size)))
+        _GEOCLIENT_CACHE[api_key] = client
+    return client
+
+
+def geocode_location(geoclient, location, retries=3, stop=None, throttle=None):
+    from opencage.geocoder import RateLimitExceededError
+
+    # The SDK's own retry only covers network errors, so rate-limited
+    # requests (HTTP 402/429) are retried here with exponential backoff.
+    # Setting `stop` aborts pending retries, e.g. once a batch has found
+    # that the daily quota is used up.
+    for attempt in range(retries + 1):
+        if stop is not None and stop.is_set():
+            raise _GeocodingStopped()
+        if throttle is not None:
+            throttle.wait()
+        try:
+            results = geoclient.geocode(location)
+            break
+        except RateLimitExceededError:
+            if attempt == retries:
+                raise
+            if stop is None:
+                time.sleep(2 ** attempt)
+            elif stop.wait(2 ** attempt):
+                raise _GeocodingStopped()
+
+    if results and len(results) > 0:
+        return results[0]['geometry']['lat'], results[0]['geometry']['lng']
+    return None
+
+
+def print_info(result):
+    text = _INFO_HEAD.format_map(result)
+    if "latitude" in result:
+        text += _INFO_COORDS.format_map(result)
+    sys.stdout.write(text + _INFO_TAIL.format_map(result))
+    sys.stdout.flush()
+
+
+def _popup_html(result):
+    lat, lng = result["latitude"], result["longitude"]
+    label = "<b style='color: #00ff00;'>%s:</b> "
+    rows = "<br>".join((
+        label % "Phone Number" + html.escape(result["number"]),
+        label % "Location" + html.escape(result["location"]),
+        label % "Carrier" + html.escape(result["carrier"]),
+        label % "Type" + result["type"],
+        label % "Coordinates" + f"{lat:.6f}, {lng:.6f}",
+        label % "Timestamp" + result["timestamp"],
+    ))
+    return f"<div style='font-family: monospace;'>{rows}</div>"
+
+
+def _tooltip(result):
+    return html.escape(f"{result['location']} - {result['carrier']}")
+
+
+def save_map(result, map_file):
+    with open(map_file, "w", encoding="utf-8") as f:
+        f.write(MAP_TEMPLATE % {
+            "lat": result["latitude"],
+            "lng": result["longitude"],
+            "popup": json.dumps(_popup_html(result)),
+            "tooltip": json.dumps(_tooltip(result)),
+        })
+
+    result["map_file"] = map_file
+    print(colored(f"[✓] Map generated → {map_file}", Colors.GREEN, bold=True))
+
+
+def save_batch_map(results, map_file):
+    locations = [
+        {
+            "lat": result["latitude"],
+            "lng": result["longitude"],
+            "popup": _popup_html(result),
+            "tooltip": _tooltip(result),
+        }
+        for result in results
+    ]
+
+    with open(map_file, "w", encoding="utf-8") as f:
+        f.write(BATCH_TEMPLATE % {"locations": json.dumps(locations)})
+
+    for result in results:
         result["map_file"] = map_file
-        print(colored(f"[✓] Map generated → {map_file}", Colors.GREEN, bold=True))
+    print(colored(f"[✓] Map with {len(results)} location(s) generated → {map_file}", Colors.GREEN, bold=True))
+
+
+def get_phone_info(phone_str, api_key, skip_type=False):
+    try:
+        parsed = validate_number(phone_str)
+    except ValueError as e:
+        print(colored(f"\n[✗] {e}\n", Colors.RED, bold=True))
+        sys.exit(1)
+
+    print(colored("\n[✓] Valid number detected", Colors.GREEN))
+    print(colored("[+] Gathering information...\n", Colors.YELLOW))
+
+    location = location_for(parsed)
+    with geo_cache.open_cache() as cache:
+        point = geo_cache.get(cache, location)
+    if point:
+        result = describe_number(phone_str, parsed, location, skip_type=skip_type)
+        print(colored("[✓] Coordinates loaded from cache", Colors.GREEN))
+    else:
+        # The geocode only needs the location string, so the carrier and
+        # type lookups run here while its HTTP round-trip is in flight.
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(lambda: geocode_location(_get_client(api_key), location))
+            result = describe_number(phone_str, parsed, location, skip_type=skip_type)
+            try:
+                point = future.result()
+                if point:
+                    with geo_cache.open_cache() as cache:
+                        geo_cache.set(cache, location, point)
+                    print(colored("[✓] Geocoding successful", Colors.GREEN))
+                else:
+                    print(colored("[!] Could not geocode the location description", Colors.YELLOW))
+            except Exception as e:
+                print(colored(f"[!] Geocoding failed: {e}", Colors.YELLOW))
+
+    now = datetime.now()
+    result["timestamp"] = now.strftime("%Y-%m-%d %H:%M:%S")
+    if point:
+        result["latitude"], result["longitude"] = point
+
+    print_info(result)
+
+    if point:
+        save_map(result, f"phone_map_{now.strftime('%Y%m%d_%H%M%S')}.html")
 
     return result
 
 
+def read_numbers(path):
+    numbers = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            numbers.append(normalize_number(line))
+    return numbers
+
+
+def get_batch_info(numbers, api_key, workers=1, rate=1.0):
+    results = []
+    seen = set()
+    # Exact repeats are dropped before any parsing work; the same number
+    # written in different formats is caught below on its E.164 form.
+    for phone_str in dict.fromkeys(numbers):
+        try:
+            parsed = validate_number(phone_str)
+        except ValueError as e:
+            print(colored(f"[✗] {phone_str}: {e}", Colors.RED))
+            continue
+
+        e164 = phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164)
+        if e164 in seen:
+            continue
+        seen.add(e164)
+        results.append(describe_number(phone_str, parsed, location_for(parsed), skip_type=True))
+
+    if not results:
+        print(colored("\n[✗] No valid phone numbers to track\n", Colors.RED, bold=True))
+        sys.exit(1)
+
+    print(colored(f"\n[✓] {len(results)} valid number(s) detected", Colors.GREEN))
+    print(colored("[+] Geocoding locations...\n", Colors.YELLOW))
+
+    # Registration areas repeat heavily across numbers, so each distinct
+    # location is geocoded once, optionally with concurrent requests.
+    # The shelf is opened once for the whole run; each open/close cycle
+    # can rewrite the index file, which adds up over a large batch.
+    points = {}
+    with geo_cache.open_cache() as cache:
+        pending = []
+        for location in dict.fromkeys(r["location"] for r in results):
+            point = geo_cache.get(cache, location)
+            if point:
+                points[location] = point
+            else:
+                pending.append(location)
+
+        if pending:
+            from opencage.geocoder import RateLimitExceededError
+
+            geoclient = _get_client(api_key, pool_size=workers)
+            stop = threading.Event()
+            throttle = _Throttle(rate)
+            with ThreadPoolExecutor(max_workers=min(workers, len(pending))) as executor:
+                futures = {executor.submit(geocode_location, geoclient, loc, stop=stop, throttle=throttle): loc for loc in pending}
+                for future in as_completed(futures):
+                    location = futures[future]
+                    points[location] = None
+                    if future.cancelled():
+                        continue
+                    try:
+                        points[location] = future.result()
+                    except _GeocodingStopped:
+                        continue
+                    except RateLimitExceededError:
+                        # Still limited after every retry: most likely the daily
+                        # quota (HTTP 402), which will not recover during this run,
+                        # so the remaining locations are skipped instead of each
+                        # sitting through the same backoff.
+                        if not stop.is_set():
+                            stop.set()
+                            for other in futures:
+                                other.cancel()
+                            print(colored("[!] OpenCage rate limit or daily quota exceeded, "
+                                          "skipping remaining locations", Colors.YELLOW))
+                        continue
+                    except Exception as e:
+                        print(colored(f"[!] Geocoding failed for {location}: {e}", Colors.YELLOW))
+                        continue
+                    if points[location]:
+                        geo_cache.set(cache, location, points[location])
+                    else:
+                        print(colored(f"[!] Could not geocode {location}", Colors.YELLOW))
+
+    now = datetime.now()
+    timestamp = now.strftime("%Y-%m-%d %H:%M:%S")
+    stamp = now.strftime("%Y%m%d_%H%M%S")
+
+    located = []
+    for result in results:
+        result["timestamp"] = timestamp
+        point = points.get(result["location"])
+        if point:
+            result["latitude"], result["longitude"] = point
+            located.append(result)
+
+        print_info(result)
+
+    if located:
+        save_batch_map(located, f"phone_map_{stamp}_batch.html")
+
+    return results
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Phone Number Tracker - Geolocation & Carrier Intelligence",
@@ -172,16 +429,21 @@ def main():
     parser.add_argument("-k", "--api-key", help="OpenCage Geocoding API key (or set OPENCAGE_API_KEY env var)")
     parser.add_argument("-o", "--open", action="store_true", help="Open generated map in browser automatically")
     parser.add_argument("-q", "--quiet", action="store_true", help="Suppress banner")
+    parser.add_argument("-s", "--skip-type", action="store_true", help="Skip number type detection (always skipped in batch mode)")
+    parser.add_argument("-b", "--batch", metavar="FILE", help="Track every phone number listed in FILE (one per line)")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="Concurrent geocoding requests in batch mode (default: 1)")
+    parser.add_argument("-r", "--rate", type=float, default=1.0, help="Maximum geocoding requests per second in batch mode (default: 1, the free tier limit)")
 
     args = parser.parse_args()
 
     if not args.quiet:
         print_banner()
 
-    if not args.number:
+    if not args.number and not args.batch:
         print(colored("[!] No phone number provided\n", Colors.RED, bold=True))
         print(f"{colored('Usage:', Colors.CYAN, bold=True)} phonetrack.py +254712345678 -k YOUR_API_KEY")
-        print(f"{colored('Example:', Colors.CYAN, bold=True)} phonetrack.py +1234567890 --open\n")
+        print(f"{colored('Example:', Colors.CYAN, bold=True)} phonetrack.py +1234567890 --open")
+        print(f"{colored('Batch:', Colors.CYAN, bold=True)}   phonetrack.py --batch numbers.txt\n")
         sys.exit(1)
 
     api_key = args.api_key or os.getenv("OPENCAGE_API_KEY")
@@ -191,10 +453,26 @@ def main():
         print(colored("    Usage: --api-key YOUR_KEY or export OPENCAGE_API_KEY=YOUR_KEY\n", Colors.YELLOW))
         sys.exit(1)
 
-    if not args.number.startswith("+"):
-        args.number = "+" + args.number
-
-    result = get_phone_info(args.number, api_key)
+    if args.batch:
+        if args.workers < 1:
+            print(colored("\n[✗] --workers must be at least 1\n", Colors.RED, bold=True))
+            sys.exit(1)
+        if args.rate <= 0:
+            print(colored("\n[✗] --rate must be greater than 0\n", Colors.RED, bold=True))
+            sys.exit(1)
+        try:
+            numbers = read_numbers(args.batch)
+        except OSError as e:
+            print(colored(f"\n[✗] Could not read batch file: {e}\n", Colors.RED, bold=True))
+            sys.exit(1)
+        results = get_batch_info(numbers, api_key, workers=args.workers, rate=args.rate)
+        map_files = [r["map_file"] for r in results if "map_file" in r]
+        if map_files and args.open:
+            webbrowser.open(f"file://{os.path.abspath(map_files[0])}")
+            print(colored("[✓] Opening map in browser...\n", Colors.GREEN))
+        return
+
+    result = get_phone_info(normalize_number(args.number), api_key, skip_type=args.skip_type)
 
     if "map_file" in result and args.open:
         full_path = os.path.abspath(result["map_file"])